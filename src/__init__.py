@@ -4,9 +4,16 @@
 __version__ = "1.0.0"
 __author__ = "Your Team Name"
 
-from . import data_loader
-from . import feature_engineering
-from . import model
-from . import visualization
+import importlib
 
-__all__ = ['data_loader', 'feature_engineering', 'model', 'visualization']
+__all__ = ['data_loader', 'data_quality', 'deduplication', 'feature_engineering', 'model', 'registry', 'visualization', 'route_planner', 'monitoring', 'bootstrap', 'partitioned', 'pipeline']
+
+
+def __getattr__(name):
+    # Submodules are imported on first use so the pipeline CLI starts without
+    # loading pandas, scikit-learn and the plotting stack
+    if name in __all__:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
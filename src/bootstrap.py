@@ -0,0 +1,230 @@
+"""
+Bootstrap Ranking Utilities
+Resample pincode-level records to put confidence intervals on district
+priority rankings
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from .feature_engineering import aggregate_update_frequency
+
+
+COUNT_COLS = ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enrollments',
+              'demo_update_count', 'bio_update_count']
+
+
+def build_pincode_table(df_enrol: pd.DataFrame,
+                         df_demo: pd.DataFrame,
+                         df_bio: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate the three datasets to one row per (state, district, pincode).
+
+    Summing these rows per district reproduces create_district_master, which
+    makes pincodes the resampling unit for the bootstrap.
+
+    Args:
+        df_enrol: Enrolment DataFrame (with features)
+        df_demo: Demographic update DataFrame
+        df_bio: Biometric update DataFrame
+
+    Returns:
+        Pincode-level DataFrame sorted by state and district
+    """
+    keys = ['state', 'district', 'pincode']
+
+    enrol = df_enrol.groupby(keys).agg({
+        'age_0_5': 'sum',
+        'age_5_17': 'sum',
+        'age_18_greater': 'sum',
+        'total_enrollments': 'sum'
+    }).reset_index()
+    enrol['has_enrolment'] = True
+
+    demo = aggregate_update_frequency(df_demo, count_col='demo_update_count')
+    bio = aggregate_update_frequency(df_bio, count_col='bio_update_count')
+
+    table = enrol.merge(demo, on=keys, how='outer').merge(bio, on=keys, how='outer')
+
+    # Keep only districts that have enrolments (as the master's left merges do)
+    districts = enrol[['state', 'district']].drop_duplicates()
+    table = table.merge(districts, on=['state', 'district'], how='inner')
+
+    table[COUNT_COLS] = table[COUNT_COLS].fillna(0)
+    table['has_enrolment'] = table['has_enrolment'].fillna(False).astype(bool)
+
+    return table.sort_values(keys).reset_index(drop=True)
+
+
+def _minmax(values: np.ndarray) -> np.ndarray:
+    """Row-wise min-max scaling (constant rows map to 0, like MinMaxScaler)."""
+    lo = values.min(axis=1, keepdims=True)
+    span = values.max(axis=1, keepdims=True) - lo
+    return (values - lo) / np.where(span == 0, 1, span)
+
+
+def _replicate_scores(sums: Dict[str, np.ndarray],
+                       model=None,
+                       scaler=None,
+                       feature_cols: list = None) -> Dict[str, np.ndarray]:
+    """
+    Recompute master features, risk and priority scores for a batch of replicates.
+
+    Mirrors create_district_master, calculate_exclusion_risk_score and
+    calculate_priority_score on (replicates, districts) arrays.
+    """
+    m = dict(sums)
+    m['demo_update_intensity'] = m['demo_update_count'] / (m['total_enrollments'] + 1)
+    m['bio_update_intensity'] = m['bio_update_count'] / (m['total_enrollments'] + 1)
+    m['child_enrollment_rate'] = m['age_0_5'] / (m['total_enrollments'] + 1)
+
+    enroll_risk = 1 - _minmax(m['total_enrollments'])
+    child_risk = 1 - _minmax(m['child_enrollment_rate'])
+    demo_risk = _minmax(m['demo_update_intensity'])
+    bio_risk = _minmax(m['bio_update_intensity'])
+    exclusion_risk = 0.35 * enroll_risk + 0.25 * child_risk + 0.20 * demo_risk + 0.20 * bio_risk
+
+    rate = m['child_enrollment_rate']
+    child_gap = rate.max(axis=1, keepdims=True) - rate
+    gap_lo = child_gap.min(axis=1, keepdims=True)
+    child_gap_norm = (child_gap - gap_lo) / (child_gap.max(axis=1, keepdims=True) - gap_lo)
+
+    if model is not None:
+        n_rep, n_dist = rate.shape
+        X = pd.DataFrame({col: m[col].ravel() for col in feature_cols})
+        risk = model.predict_proba(scaler.transform(X))[:, 1].reshape(n_rep, n_dist)
+    else:
+        risk = exclusion_risk
+
+    composite = (40 * risk + 30 * child_gap_norm + 20 * demo_risk + 10 * bio_risk) * 100
+
+    return {'priority_score': np.clip(composite, 0, 100), 'composite': composite}
+
+
+def _rank_descending(scores: np.ndarray) -> np.ndarray:
+    """Rank each row descending (1 = highest); NaN scores rank last."""
+    order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), axis=1, kind='stable')
+    ranks = np.empty_like(order, dtype=np.int32)
+    rows = np.arange(scores.shape[0])[:, None]
+    ranks[rows, order] = np.arange(1, scores.shape[1] + 1)
+    return ranks
+
+
+# Per-process state set once by the pool initializer (avoids re-pickling arrays per batch)
+_WORKER: Dict = {}
+
+
+def _init_worker(payload: Dict):
+    _WORKER.clear()
+    _WORKER.update(payload)
+
+
+def _bootstrap_batch(seed: np.random.SeedSequence, n_replicates: int) -> np.ndarray:
+    """Draw n_replicates cluster-bootstrap samples and return their rank matrix."""
+    rng = np.random.default_rng(seed)
+    values = _WORKER['values']
+    starts, sizes, row_district = _WORKER['starts'], _WORKER['sizes'], _WORKER['row_district']
+    n_rows = len(row_district)
+
+    # Each district draws as many pincodes as it has, with replacement
+    draws = starts[row_district] + (rng.random((n_replicates, n_rows)) *
+                                    sizes[row_district]).astype(np.int64)
+    flat = (draws + np.arange(n_replicates)[:, None] * n_rows).ravel()
+    weights = np.bincount(flat, minlength=n_replicates * n_rows).reshape(n_replicates, n_rows)
+
+    sums = {col: np.add.reduceat(weights * values[col], starts, axis=1) for col in COUNT_COLS}
+    sums['pincode_count'] = np.add.reduceat((weights > 0) & values['has_enrolment'], starts, axis=1)
+
+    scores = _replicate_scores(sums, _WORKER['model'], _WORKER['scaler'], _WORKER['feature_cols'])
+    return _rank_descending(scores['composite'])
+
+
+def bootstrap_priority_rankings(df_pincodes: pd.DataFrame,
+                                 n_replicates: int = 1000,
+                                 top_k: int = 100,
+                                 model=None,
+                                 scaler=None,
+                                 feature_cols: list = None,
+                                 confidence: float = 0.90,
+                                 batch_size: int = 50,
+                                 n_jobs: Optional[int] = None,
+                                 random_state: int = 42) -> pd.DataFrame:
+    """
+    Bootstrap district priority rankings with a process pool.
+
+    Pincode rows are resampled with replacement within each district, the
+    master features, risk and priority scores are recomputed in vectorised
+    batches and every replicate is ranked. Ranks use the priority score
+    before its 0-100 clip so districts saturated at 100 are still ordered.
+
+    Args:
+        df_pincodes: Output of build_pincode_table
+        n_replicates: Number of bootstrap replicates
+        top_k: Size of the intervention list (e.g. top 100 districts)
+        model: Trained model for predicted_risk_probability (if None, uses
+               exclusion_risk_score like calculate_priority_score)
+        scaler: Fitted scaler (required with model)
+        feature_cols: Feature columns used in training (required with model)
+        confidence: Width of the reported rank interval
+        batch_size: Replicates per worker task
+        n_jobs: Worker processes (if None, uses all CPUs; 1 runs in-process)
+        random_state: Random seed for reproducibility
+
+    Returns:
+        DataFrame with point score and rank, rank interval and top-K probability
+    """
+    if model is not None and (scaler is None or feature_cols is None):
+        raise ValueError("scaler and feature_cols are required when a model is given")
+
+    table = df_pincodes.sort_values(['state', 'district']).reset_index(drop=True)
+    district_codes, districts = pd.factorize(pd.MultiIndex.from_frame(table[['state', 'district']]))
+    starts = np.flatnonzero(np.r_[True, district_codes[1:] != district_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(table)])
+
+    payload = {
+        'values': {col: table[col].to_numpy(dtype=float) for col in COUNT_COLS},
+        'starts': starts,
+        'sizes': sizes,
+        'row_district': district_codes,
+        'model': model,
+        'scaler': scaler,
+        'feature_cols': feature_cols
+    }
+    payload['values']['has_enrolment'] = table['has_enrolment'].to_numpy(dtype=bool)
+
+    # Point estimate: every pincode weighted once
+    point_sums = {col: np.add.reduceat(payload['values'][col][None, :], starts, axis=1)
+                  for col in COUNT_COLS}
+    point_sums['pincode_count'] = np.add.reduceat(
+        payload['values']['has_enrolment'][None, :].astype(float), starts, axis=1)
+    point = _replicate_scores(point_sums, model, scaler, feature_cols)
+
+    seeds = np.random.SeedSequence(random_state).spawn((n_replicates + batch_size - 1) // batch_size)
+    sizes_per_batch = [min(batch_size, n_replicates - i * batch_size) for i in range(len(seeds))]
+
+    if n_jobs == 1:
+        _init_worker(payload)
+        ranks = [_bootstrap_batch(s, n) for s, n in zip(seeds, sizes_per_batch)]
+    else:
+        workers = n_jobs or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(payload,)) as pool:
+            ranks = list(pool.map(_bootstrap_batch, seeds, sizes_per_batch))
+    ranks = np.vstack(ranks)
+
+    alpha = (1 - confidence) / 2
+    result = pd.DataFrame({
+        'state': districts.get_level_values(0),
+        'district': districts.get_level_values(1),
+        'priority_score': point['priority_score'][0],
+        'rank': _rank_descending(point['composite'])[0],
+        'rank_median': np.median(ranks, axis=0),
+        'rank_lower': np.quantile(ranks, alpha, axis=0),
+        'rank_upper': np.quantile(ranks, 1 - alpha, axis=0),
+        'top_k_probability': (ranks <= top_k).mean(axis=0)
+    })
+
+    return result.sort_values('rank').reset_index(drop=True)
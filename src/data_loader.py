@@ -6,64 +6,163 @@ Load and concatenate Aadhaar datasets (Enrolment, Demographic, Biometric)
 import pandas as pd
 import glob
 import os
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+from .data_quality import (DATE_FORMAT, DATASET_SCHEMAS, validate_records, split_quarantine,
+                           shard_quality_metrics, combine_quality_metrics)
+from .deduplication import plan_shards, iter_shard_chunks, deduplicate_chunks
 
-def load_enrolment_data(data_dir: str = '../dataset') -> pd.DataFrame:
+
+DATASET_DIRS = {
+    'enrolment': 'api_data_aadhar_enrolment',
+    'demographic': 'api_data_aadhar_demographic',
+    'biometric': 'api_data_aadhar_biometric',
+}
+
+
+def get_dataset_files(data_dir: str, dataset: str) -> List[str]:
     """
-    Load and concatenate all enrolment CSV files.
+    List the CSV shards of one dataset.
     
     Args:
         data_dir: Path to dataset directory
+        dataset: One of 'enrolment', 'demographic', 'biometric'
         
     Returns:
-        Combined DataFrame with all enrolment records
+        Sorted list of shard file paths
     """
-    files = glob.glob(os.path.join(data_dir, 'api_data_aadhar_enrolment',
-                                    'api_data_aadhar_enrolment', '*.csv'))
+    folder = DATASET_DIRS[dataset]
+    return sorted(glob.glob(os.path.join(data_dir, folder, folder, '*.csv')))
+
+
+def empty_dataset_frame(dataset: str) -> pd.DataFrame:
+    """
+    Build an empty DataFrame with the columns of one dataset.
     
-    df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    Used when a dataset has no shards, so downstream aggregation sees zero
+    records instead of failing.
     
-    return df
+    Args:
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        
+    Returns:
+        Empty DataFrame with date, state, district, pincode and count columns
+    """
+    columns = {
+        'date': pd.Series(dtype='datetime64[ns]'),
+        'state': pd.Series(dtype=str),
+        'district': pd.Series(dtype=str),
+        'pincode': pd.Series(dtype='int64')
+    }
+    columns.update({col: pd.Series(dtype='int64') for col in DATASET_SCHEMAS[dataset]})
+    return pd.DataFrame(columns)
 
 
-def load_demographic_data(data_dir: str = '../dataset') -> pd.DataFrame:
+def iter_parsed_chunks(plan: pd.DataFrame,
+                        chunksize: int = 500000):
     """
-    Load and concatenate all demographic update CSV files.
+    Read the active shards of a plan in chunks and parse their dates.
+    
+    Shared by the single-process and partitioned loaders so both see
+    identical records.
+    
+    Args:
+        plan: Output of plan_shards
+        chunksize: Rows read per chunk
+        
+    Yields:
+        Tuples of (shard name, chunk with parsed dates)
+    """
+    for shard, chunk in iter_shard_chunks(plan, chunksize):
+        chunk['date'] = pd.to_datetime(chunk['date'], format=DATE_FORMAT, errors='coerce')
+        yield shard, chunk
+
+
+def load_dataset(data_dir: str = '../dataset',
+                  dataset: str = 'enrolment',
+                  deduplicate: bool = True,
+                  chunksize: int = 500000) -> pd.DataFrame:
+    """
+    Load one dataset shard by shard, dropping overlapping records.
+    
+    Shards are read in chunks, latest range first. With deduplicate=True
+    rows are keyed on (date, state, district, pincode) and a record that
+    appears in several shards is kept only from the latest one, so
+    overlapping re-downloads are not double-counted.
     
     Args:
         data_dir: Path to dataset directory
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        deduplicate: Drop duplicate and superseded records
+        chunksize: Rows read per chunk
         
     Returns:
-        Combined DataFrame with all demographic update records
+        Combined DataFrame with parsed dates (empty, with the dataset's
+        columns, if no shards are found)
     """
-    files = glob.glob(os.path.join(data_dir, 'api_data_aadhar_demographic',
-                                    'api_data_aadhar_demographic', '*.csv'))
+    plan = plan_shards(get_dataset_files(data_dir, dataset))
     
-    df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    chunks = iter_parsed_chunks(plan, chunksize)
+    duplicates = {}
+    if deduplicate:
+        chunks = deduplicate_chunks(chunks, stats=duplicates)
+    
+    parts = [chunk for _, chunk in chunks]
+    if not parts:
+        print(f"WARNING: No {dataset} shards found in {data_dir}, using an empty dataset")
+        return empty_dataset_frame(dataset)
+    df = pd.concat(parts, ignore_index=True)
+    
+    removed_count = sum(duplicates.values())
+    if removed_count > 0:
+        print(f"WARNING: Removed {removed_count:,} duplicate {dataset} rows from overlapping shards")
     
     return df
 
 
-def load_biometric_data(data_dir: str = '../dataset') -> pd.DataFrame:
+def load_enrolment_data(data_dir: str = '../dataset',
+                         deduplicate: bool = True) -> pd.DataFrame:
     """
-    Load and concatenate all biometric update CSV files.
+    Load and concatenate all enrolment CSV files.
     
     Args:
         data_dir: Path to dataset directory
+        deduplicate: Drop re-downloaded rows, keeping the latest correction
         
     Returns:
-        Combined DataFrame with all biometric update records
+        Combined DataFrame with all enrolment records
+    """
+    return load_dataset(data_dir, 'enrolment', deduplicate=deduplicate)
+
+
+def load_demographic_data(data_dir: str = '../dataset',
+                           deduplicate: bool = True) -> pd.DataFrame:
     """
-    files = glob.glob(os.path.join(data_dir, 'api_data_aadhar_biometric',
-                                    'api_data_aadhar_biometric', '*.csv'))
+    Load and concatenate all demographic update CSV files.
     
-    df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    Args:
+        data_dir: Path to dataset directory
+        deduplicate: Drop re-downloaded rows, keeping the latest correction
+        
+    Returns:
+        Combined DataFrame with all demographic update records
+    """
+    return load_dataset(data_dir, 'demographic', deduplicate=deduplicate)
+
+
+def load_biometric_data(data_dir: str = '../dataset',
+                         deduplicate: bool = True) -> pd.DataFrame:
+    """
+    Load and concatenate all biometric update CSV files.
     
-    return df
+    Args:
+        data_dir: Path to dataset directory
+        deduplicate: Drop re-downloaded rows, keeping the latest correction
+        
+    Returns:
+        Combined DataFrame with all biometric update records
+    """
+    return load_dataset(data_dir, 'biometric', deduplicate=deduplicate)
 
 
 def load_all_datasets(data_dir: str = '../dataset') -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -136,3 +235,64 @@ def remove_missing_critical_fields(df: pd.DataFrame,
         print(f"WARNING: Removed {removed_count:,} rows with missing critical fields")
     
     return df
+
+
+def load_validated_data(data_dir: str = '../dataset',
+                         dataset: str = 'enrolment',
+                         as_of: Optional[pd.Timestamp] = None,
+                         deduplicate: bool = True,
+                         chunksize: int = 500000) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Load one dataset and validate each chunk in the same pass.
+    
+    Each chunk is checked right after it is read (missing fields, bad or
+    future dates, negative counts, out-of-range pincodes, state/pincode
+    prefix mismatches, unknown states); failing rows go to a quarantine table instead of
+    being silently coerced. Clean rows are then deduplicated across
+    overlapping shards as in load_dataset.
+    
+    Args:
+        data_dir: Path to dataset directory
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        as_of: Dates after this timestamp are flagged as future (default: today)
+        deduplicate: Drop duplicate and superseded records
+        chunksize: Rows read per chunk
+        
+    Returns:
+        Tuple of (clean_df, quarantine_df, shard_metrics_df)
+    """
+    plan = plan_shards(get_dataset_files(data_dir, dataset))
+    quarantine_parts, metrics = [], []
+    
+    def validated_chunks():
+        for shard, chunk in iter_shard_chunks(plan, chunksize):
+            df, flags = validate_records(chunk, dataset, as_of=as_of)
+            clean, quarantine = split_quarantine(df, flags, shard)
+            quarantine_parts.append(quarantine)
+            metrics.append(shard_quality_metrics(df, flags, shard))
+            yield shard, clean
+    
+    chunks = validated_chunks()
+    duplicates = {}
+    if deduplicate:
+        chunks = deduplicate_chunks(chunks, stats=duplicates)
+    
+    parts = [chunk for _, chunk in chunks]
+    if not parts:
+        print(f"WARNING: No {dataset} shards found in {data_dir}, using an empty dataset")
+        df_clean = empty_dataset_frame(dataset)
+        df_quarantine = df_clean.assign(dq_flags=pd.Series(dtype='uint8'),
+                                        dq_reasons=pd.Series(dtype=str),
+                                        source_shard=pd.Series(dtype=str))
+    else:
+        df_clean = pd.concat(parts, ignore_index=True)
+        df_quarantine = pd.concat(quarantine_parts, ignore_index=True)
+    
+    df_metrics = combine_quality_metrics(metrics)
+    df_metrics['duplicate_rows'] = df_metrics['shard'].map(duplicates).fillna(0).astype(int)
+    df_metrics = plan[['shard', 'start', 'end', 'status']].merge(df_metrics, on='shard', how='left')
+    
+    if len(df_quarantine) > 0:
+        print(f"WARNING: Quarantined {len(df_quarantine):,} {dataset} rows failing quality checks")
+    
+    return df_clean, df_quarantine, df_metrics
@@ -0,0 +1,294 @@
+"""
+Data Quality Utilities
+Schema definitions and vectorised validation checks applied while loading
+Aadhaar datasets (Enrolment, Demographic, Biometric)
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+
+DATE_FORMAT = '%d-%m-%Y'
+
+# Count columns per dataset (all must be non-negative integers)
+DATASET_SCHEMAS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+}
+
+CRITICAL_COLUMNS = ['date', 'state', 'district', 'pincode']
+
+# Valid Indian pincodes start with 1-8
+PINCODE_MIN = 110000
+PINCODE_MAX = 859999
+
+# First two pincode digits allotted to each state / UT (India Post postal circles)
+STATE_PINCODE_PREFIXES = {
+    'andaman and nicobar islands': [74],
+    'andhra pradesh': [50, 51, 52, 53],
+    'arunachal pradesh': [79],
+    'assam': [78],
+    'bihar': [80, 81, 82, 83, 84, 85],
+    'chandigarh': [16],
+    'chhattisgarh': [49],
+    'dadra and nagar haveli': [39],
+    'dadra and nagar haveli and daman and diu': [36, 39],
+    'daman and diu': [36, 39],
+    'delhi': [11],
+    'goa': [40],
+    'gujarat': [36, 37, 38, 39],
+    'haryana': [12, 13],
+    'himachal pradesh': [17],
+    'jammu and kashmir': [18, 19],
+    'jharkhand': [81, 82, 83],
+    'karnataka': [56, 57, 58, 59],
+    'kerala': [67, 68, 69],
+    'ladakh': [19],
+    'lakshadweep': [68],
+    'madhya pradesh': [45, 46, 47, 48],
+    'maharashtra': [40, 41, 42, 43, 44],
+    'manipur': [79],
+    'meghalaya': [79],
+    'mizoram': [79],
+    'nagaland': [79],
+    'odisha': [75, 76, 77],
+    'orissa': [75, 76, 77],
+    'puducherry': [53, 60, 67],
+    'pondicherry': [53, 60, 67],
+    'punjab': [14, 15, 16],
+    'rajasthan': [30, 31, 32, 33, 34],
+    'sikkim': [73],
+    'tamil nadu': [60, 61, 62, 63, 64],
+    'telangana': [50],
+    'tripura': [79],
+    'uttar pradesh': [20, 21, 22, 23, 24, 25, 26, 27, 28],
+    'uttarakhand': [24, 26],
+    'uttaranchal': [24, 26],
+    'west bengal': [70, 71, 72, 73, 74],
+}
+
+# Common misspellings seen in the source data, mapped to their canonical state
+STATE_NAME_ALIASES = {
+    'west bangal': 'west bengal',
+    'westbengal': 'west bengal',
+    'west bengli': 'west bengal',
+    'chhatisgarh': 'chhattisgarh',
+    'tamilnadu': 'tamil nadu',
+    'jammu kashmir': 'jammu and kashmir',
+    'andaman nicobar islands': 'andaman and nicobar islands',
+}
+
+# Validation checks in bit order (a row's dq_flags is the OR of failed checks)
+QUALITY_CHECKS = [
+    'missing_critical',
+    'invalid_date',
+    'future_date',
+    'invalid_count',
+    'negative_count',
+    'invalid_pincode',
+    'state_pincode_mismatch',
+    'unknown_state',
+]
+
+
+def normalize_state_name(name: str) -> str:
+    """
+    Normalise a state name for lookups ('Jammu & Kashmir' -> 'jammu and kashmir').
+
+    Args:
+        name: Raw state name
+
+    Returns:
+        Lower-case state name with '&' spelled out and whitespace collapsed
+    """
+    name = str(name).lower().replace('&', ' and ')
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def _state_prefix_table(states: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build per-row state codes, a (n_states, 100) table of allowed pincode
+    prefixes and a per-state known flag.
+
+    Only the distinct state values are normalised, so the cost is independent
+    of the number of rows. Unknown states get an all-True prefix row (the
+    prefix cannot be checked) and are reported through the known flag instead.
+    """
+    codes, uniques = pd.factorize(states)
+    table = np.ones((len(uniques) + 1, 100), dtype=bool)  # last row: missing state
+    known = np.ones(len(uniques) + 1, dtype=bool)  # missing states are flagged as missing_critical
+
+    for i, state in enumerate(uniques):
+        name = normalize_state_name(state)
+        prefixes = STATE_PINCODE_PREFIXES.get(STATE_NAME_ALIASES.get(name, name))
+        if prefixes is None:
+            known[i] = False
+        else:
+            table[i] = False
+            table[i, prefixes] = True
+
+    codes = np.where(codes < 0, len(uniques), codes)
+    return codes, table, known
+
+
+def validate_records(df: pd.DataFrame,
+                      dataset: str,
+                      as_of: Optional[pd.Timestamp] = None) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Run all quality checks on a freshly read shard and parse its dates.
+
+    Every check is a vectorised column operation over the shard that was just
+    read, so validation happens in the same pass as loading.
+
+    Args:
+        df: Raw DataFrame as read from CSV, date still a string (modified in place
+            to avoid copying large shards)
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        as_of: Dates after this timestamp are flagged (default: today)
+
+    Returns:
+        Tuple of (DataFrame with parsed date and numeric counts, per-row dq_flags bitmask)
+    """
+    if dataset not in DATASET_SCHEMAS:
+        raise ValueError(f"Unknown dataset '{dataset}', expected one of {list(DATASET_SCHEMAS)}")
+
+    if as_of is None:
+        as_of = pd.Timestamp.now().normalize()
+
+    flags = np.zeros(len(df), dtype=np.uint8)
+    bit = {name: np.uint8(1 << i) for i, name in enumerate(QUALITY_CHECKS)}
+
+    # Missing critical fields
+    present = [c for c in CRITICAL_COLUMNS if c in df.columns]
+    missing = df[present].isna().any(axis=1).to_numpy()
+    flags[missing] |= bit['missing_critical']
+
+    # Dates: unparseable strings vs. dates in the future
+    raw_date = df['date']
+    df['date'] = pd.to_datetime(raw_date, format=DATE_FORMAT, errors='coerce')
+    flags[(df['date'].isna() & raw_date.notna()).to_numpy()] |= bit['invalid_date']
+    flags[(df['date'] > as_of).to_numpy()] |= bit['future_date']
+
+    # Counts: non-numeric or negative
+    for col in DATASET_SCHEMAS[dataset]:
+        if col not in df.columns:
+            raise ValueError(f"Dataset '{dataset}' is missing column '{col}'")
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            raw = df[col]
+            df[col] = pd.to_numeric(raw, errors='coerce')
+            flags[(df[col].isna() & raw.notna()).to_numpy()] |= bit['invalid_count']
+        flags[(df[col] < 0).to_numpy()] |= bit['negative_count']
+
+    # Pincodes: 6 digits in the allotted range, prefix consistent with a known state
+    pincode = pd.to_numeric(df['pincode'], errors='coerce').to_numpy(dtype=float)
+    valid_pin = (pincode >= PINCODE_MIN) & (pincode <= PINCODE_MAX) & (pincode % 1 == 0)
+    flags[~valid_pin & df['pincode'].notna().to_numpy()] |= bit['invalid_pincode']
+
+    codes, table, known = _state_prefix_table(df['state'])
+    prefix = np.where(valid_pin, pincode // 10000, 0).astype(np.int64)
+    mismatch = valid_pin & ~table[codes, prefix]
+    flags[mismatch] |= bit['state_pincode_mismatch']
+    flags[~known[codes]] |= bit['unknown_state']
+
+    return df, pd.Series(flags, index=df.index, name='dq_flags')
+
+
+def describe_flags(flags: pd.Series) -> pd.Series:
+    """
+    Convert dq_flags bitmasks into readable reasons ('negative_count;future_date').
+
+    Args:
+        flags: Series of dq_flags bitmasks
+
+    Returns:
+        Series of semicolon-separated check names
+    """
+    lookup = {}
+    for value in pd.unique(flags):
+        lookup[value] = ';'.join(
+            name for i, name in enumerate(QUALITY_CHECKS) if int(value) & (1 << i)
+        )
+    return flags.map(lookup)
+
+
+def split_quarantine(df: pd.DataFrame,
+                      flags: pd.Series,
+                      shard: str = '') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split validated records into clean rows and a quarantine table.
+
+    Args:
+        df: Validated DataFrame
+        flags: dq_flags returned by validate_records
+        shard: Source shard name recorded on quarantined rows
+
+    Returns:
+        Tuple of (clean DataFrame, quarantine DataFrame with dq_reasons)
+    """
+    bad = flags.to_numpy() != 0
+    clean = df[~bad]
+
+    quarantine = df[bad].copy()
+    quarantine['dq_flags'] = flags[bad]
+    quarantine['dq_reasons'] = describe_flags(quarantine['dq_flags'])
+    quarantine['source_shard'] = shard
+
+    return clean, quarantine
+
+
+def shard_quality_metrics(df: pd.DataFrame,
+                           flags: pd.Series,
+                           shard: str = '') -> Dict:
+    """
+    Summarise data quality for one shard.
+
+    Args:
+        df: Validated DataFrame
+        flags: dq_flags returned by validate_records
+        shard: Shard name
+
+    Returns:
+        Dictionary with row counts, failures per check and date range
+    """
+    values = flags.to_numpy()
+    metrics = {
+        'shard': shard,
+        'rows': len(df),
+        'valid_rows': int((values == 0).sum()),
+        'quarantined_rows': int((values != 0).sum()),
+    }
+    for i, name in enumerate(QUALITY_CHECKS):
+        metrics[name] = int(((values & (1 << i)) != 0).sum())
+
+    metrics['quarantine_rate'] = metrics['quarantined_rows'] / metrics['rows'] if len(df) else 0.0
+    metrics['min_date'] = df['date'].min()
+    metrics['max_date'] = df['date'].max()
+
+    return metrics
+
+
+def combine_quality_metrics(metrics: List[Dict]) -> pd.DataFrame:
+    """
+    Combine per-chunk quality metrics into one row per shard.
+
+    Args:
+        metrics: List of shard_quality_metrics results (one per chunk)
+
+    Returns:
+        DataFrame of per-shard quality metrics
+    """
+    counts = ['rows', 'valid_rows', 'quarantined_rows'] + QUALITY_CHECKS
+    df = pd.DataFrame(metrics)
+    if df.empty:
+        return pd.DataFrame(columns=['shard'] + counts + ['min_date', 'max_date', 'quarantine_rate'])
+
+    agg = {col: 'sum' for col in counts}
+    agg.update({'min_date': 'min', 'max_date': 'max'})
+
+    combined = df.groupby('shard', sort=False).agg(agg).reset_index()
+    combined['quarantine_rate'] = combined['quarantined_rows'] / combined['rows'].clip(lower=1)
+
+    return combined
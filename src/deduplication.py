@@ -0,0 +1,232 @@
+"""
+Shard Deduplication Utilities
+Range-aware bookkeeping for overlapping CSV shards and streaming,
+bounded-memory deduplication of Aadhaar records
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+RECORD_KEY = ['date', 'state', 'district', 'pincode']
+
+# Shard names end with the record range they contain: ..._1000000_1006029.csv
+# (browser re-downloads may add a ' (1)' suffix)
+SHARD_RANGE_PATTERN = re.compile(r'_(\d+)_(\d+)(?: \((\d+)\))?\.csv$')
+
+
+def parse_shard_range(path: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Extract the (start, end) record range encoded in a shard file name.
+
+    Args:
+        path: Shard file path
+
+    Returns:
+        Tuple of (start, end), or (None, None) if the name has no range
+    """
+    match = SHARD_RANGE_PATTERN.search(os.path.basename(path))
+    if match is None:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+
+def parse_redownload_index(path: str) -> int:
+    """
+    Extract the browser re-download suffix of a shard file name.
+
+    Args:
+        path: Shard file path
+
+    Returns:
+        N for a name ending in ' (N).csv', otherwise 0
+    """
+    match = SHARD_RANGE_PATTERN.search(os.path.basename(path))
+    if match is None or match.group(3) is None:
+        return 0
+    return int(match.group(3))
+
+
+def plan_shards(files: List[str]) -> pd.DataFrame:
+    """
+    Build the shard bookkeeping table for one dataset.
+
+    Shards are ordered by the record range in their file name, then by the
+    re-download suffix, so a later range or a later re-download of the same
+    range wins. File modification time only breaks remaining ties, which
+    keeps the order stable across clones and copies of the data. A shard
+    whose exact range was downloaded again is marked 'superseded' so it is
+    never read; partially overlapping shards stay 'active' and are resolved
+    row by row.
+
+    Args:
+        files: Shard file paths
+
+    Returns:
+        DataFrame with shard, path, start, end, redownload, mtime, load_order,
+        status, overlaps
+    """
+    rows = []
+    for f in files:
+        start, end = parse_shard_range(f)
+        stat = os.stat(f)
+        rows.append({
+            'shard': os.path.basename(f),
+            'path': f,
+            'start': start,
+            'end': end,
+            'redownload': parse_redownload_index(f),
+            'mtime': stat.st_mtime,
+            'size_bytes': stat.st_size
+        })
+
+    plan = pd.DataFrame(rows, columns=['shard', 'path', 'start', 'end', 'redownload',
+                                       'mtime', 'size_bytes'])
+    plan = plan.sort_values(['start', 'end', 'redownload', 'mtime', 'shard'],
+                            kind='stable').reset_index(drop=True)
+    plan['load_order'] = np.arange(len(plan))
+
+    # Identical ranges: only the latest re-download is read
+    has_range = plan['start'].notna()
+    latest = plan[has_range].groupby(['start', 'end'])['load_order'].transform('max')
+    plan['status'] = 'active'
+    plan.loc[latest.index[latest != plan.loc[latest.index, 'load_order']], 'status'] = 'superseded'
+
+    # Record which other shards each shard overlaps with
+    starts = plan['start'].to_numpy(dtype=float)
+    ends = plan['end'].to_numpy(dtype=float)
+    overlap = (starts[:, None] <= ends[None, :]) & (starts[None, :] <= ends[:, None])
+    np.fill_diagonal(overlap, False)
+    names = plan['shard'].to_numpy()
+    plan['overlaps'] = [';'.join(names[row]) for row in overlap]
+
+    return plan
+
+
+def iter_shard_chunks(plan: pd.DataFrame,
+                       chunksize: int = 500000) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Read active shards in chunks, latest in load order first.
+
+    Args:
+        plan: Output of plan_shards
+        chunksize: Rows per chunk
+
+    Yields:
+        Tuples of (shard name, raw chunk)
+    """
+    active = plan[plan['status'] == 'active'].sort_values('load_order', ascending=False)
+    for shard, path in zip(active['shard'], active['path']):
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            yield shard, chunk
+
+
+class _KeyHashIndex:
+    """
+    Set of 64-bit key hashes stored as a few sorted numpy arrays.
+
+    Memory is 8 bytes per distinct key (no row payloads are kept); new hashes
+    are appended as sorted runs and merged once too many runs accumulate.
+    """
+
+    def __init__(self, max_runs: int = 8):
+        self.runs: List[np.ndarray] = []
+        self.max_runs = max_runs
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self.runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[pos] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        self.runs.append(np.unique(hashes))
+        if len(self.runs) > self.max_runs:
+            self.runs = [np.unique(np.concatenate(self.runs))]
+
+
+def _canonical_key(values: pd.Series) -> pd.Series:
+    """
+    Normalise one key column so the hash does not depend on inferred dtypes.
+
+    Dates are kept as parsed. Everything else becomes stripped text, with
+    integral numbers written without a decimal part, so 110001, 110001.0 and
+    ' 110001' (or ' Delhi' and 'Delhi') hash the same. Case is kept: name
+    cleanup is left to clean_text_fields, so 'Yadgir' and 'yadgir' stay
+    separate records here.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values) and (values.isna() | (values % 1 == 0)).all():
+        return values.astype('Int64').astype('string')
+    text = values.astype('string').str.strip()
+    return text.str.replace(r'^(\d+)\.0*$', r'\1', regex=True)
+
+
+def hash_record_keys(df: pd.DataFrame, key_cols: List[str] = RECORD_KEY) -> np.ndarray:
+    """
+    Hash the record key of every row to a uint64.
+
+    Key columns are normalised first (see _canonical_key), so the same
+    record hashes identically whichever chunk or shard it was read from.
+
+    Args:
+        df: DataFrame containing the key columns
+        key_cols: Columns identifying a record
+
+    Returns:
+        Array of uint64 hashes
+    """
+    keys = pd.DataFrame({col: _canonical_key(df[col]) for col in key_cols})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def deduplicate_chunks(chunks: Iterable[Tuple[str, pd.DataFrame]],
+                        key_cols: List[str] = RECORD_KEY,
+                        stats: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Drop duplicate and superseded records from a stream of chunks.
+
+    Chunks must arrive latest shard first, each shard's chunks contiguous (as
+    produced by iter_shard_chunks). A row is dropped only if a different,
+    earlier-processed shard already supplied its key, i.e. a later correction
+    of the same record exists. Rows repeating a key within one shard are
+    distinct source records and are all kept. Only key hashes are retained,
+    so memory stays bounded by 8 bytes per distinct record plus one shard's
+    hashes and one chunk.
+
+    Args:
+        chunks: Iterable of (shard name, chunk)
+        key_cols: Columns identifying a record
+        stats: Optional dict updated with dropped row counts per shard
+
+    Yields:
+        Tuples of (shard name, deduplicated chunk)
+    """
+    seen = _KeyHashIndex()
+    current_shard, shard_hashes = None, []
+
+    for shard, chunk in chunks:
+        # Keys of a shard only count as seen once all of its chunks are read
+        if shard != current_shard:
+            if shard_hashes:
+                seen.add(np.concatenate(shard_hashes))
+            current_shard, shard_hashes = shard, []
+
+        hashes = hash_record_keys(chunk, key_cols)
+        keep = ~seen.contains(hashes)
+        shard_hashes.append(hashes[keep])
+
+        if stats is not None:
+            stats[shard] = stats.get(shard, 0) + int((~keep).sum())
+
+        yield shard, chunk[keep]
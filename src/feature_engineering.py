@@ -94,6 +94,23 @@ def create_district_master(df_enrol: pd.DataFrame,
         'bio_update_count': 'sum'
     }).reset_index()
     
+    return merge_district_aggregates(enrol_district, district_demo, district_bio)
+
+
+def merge_district_aggregates(enrol_district: pd.DataFrame,
+                               district_demo: pd.DataFrame,
+                               district_bio: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge district-level aggregates into the master table and derive metrics.
+    
+    Args:
+        enrol_district: Enrolment sums and pincode_count per (state, district)
+        district_demo: demo_update_count per (state, district)
+        district_bio: bio_update_count per (state, district)
+        
+    Returns:
+        Master district DataFrame with all metrics
+    """
     # Merge all
     df_master = enrol_district.merge(district_demo, on=['state', 'district'], how='left')
     df_master = df_master.merge(district_bio, on=['state', 'district'], how='left')
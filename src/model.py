@@ -15,6 +15,21 @@ from sklearn.metrics import (classification_report, confusion_matrix,
 from typing import Tuple, Dict
 
 
+# Default model features (master district columns)
+FEATURE_COLS = [
+    'total_enrollments',
+    'age_0_5',
+    'age_5_17',
+    'age_18_greater',
+    'child_enrollment_rate',
+    'demo_update_count',
+    'bio_update_count',
+    'demo_update_intensity',
+    'bio_update_intensity',
+    'pincode_count'
+]
+
+
 def prepare_features(df: pd.DataFrame, 
                       feature_cols: list = None) -> Tuple[pd.DataFrame, pd.Series]:
     """
@@ -28,18 +43,7 @@ def prepare_features(df: pd.DataFrame,
         Tuple of (X features, y target)
     """
     if feature_cols is None:
-        feature_cols = [
-            'total_enrollments',
-            'age_0_5',
-            'age_5_17',
-            'age_18_greater',
-            'child_enrollment_rate',
-            'demo_update_count',
-            'bio_update_count',
-            'demo_update_intensity',
-            'bio_update_intensity',
-            'pincode_count'
-        ]
+        feature_cols = FEATURE_COLS
     
     X = df[feature_cols].copy()
     y = df['is_high_risk'].copy()
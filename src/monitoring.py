@@ -0,0 +1,266 @@
+"""
+Model Monitoring Utilities
+Track feature drift and prediction score shift across daily refreshes
+against the training reference
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from .model import FEATURE_COLS
+
+
+# Alert thresholds (common PSI rule of thumb: <0.1 stable, 0.1-0.25 moderate, >0.25 major)
+PSI_WARN = 0.10
+PSI_ALERT = 0.25
+KS_WARN = 0.10
+KS_ALERT = 0.20
+CHURN_WARN = 0.20
+CHURN_ALERT = 0.40
+MISSING_WARN = 0.05
+MISSING_ALERT = 0.10
+
+STATUS_LEVELS = ['ok', 'warn', 'alert']
+
+PREDICTION_COL = 'predicted_risk_probability'
+HIGH_RISK_COL = 'predicted_high_risk'
+
+
+def _histogram(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Count values into bins defined by edges; the outer bins are open-ended."""
+    values = values[~np.isnan(values)]
+    bins = np.searchsorted(edges[1:-1], values, side='right')
+    return np.bincount(bins, minlength=len(edges) - 1)
+
+
+def _reference_histogram(values: np.ndarray, n_bins: int) -> Dict:
+    """Quantile-binned histogram of reference values (plus their missing rate)."""
+    missing_rate = float(np.isnan(values).mean()) if len(values) else 0.0
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        edges = np.array([0.0, 1.0])
+    else:
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([edges[0] - 0.5, edges[0] + 0.5])
+    counts = _histogram(values, edges)
+    return {'edges': edges.tolist(), 'counts': counts.tolist(), 'missing_rate': missing_rate}
+
+
+def _district_keys(df: pd.DataFrame) -> List[str]:
+    """Identify districts as 'state|district' strings."""
+    return (df['state'].astype(str) + '|' + df['district'].astype(str)).tolist()
+
+
+def _high_risk_districts(df: pd.DataFrame) -> List[str]:
+    """Districts the model classifies as high risk (predicted_high_risk == 1)."""
+    return sorted(_district_keys(df[df[HIGH_RISK_COL] == 1]))
+
+
+def population_stability_index(ref_counts: np.ndarray,
+                                 new_counts: np.ndarray,
+                                 eps: float = 1e-4) -> float:
+    """
+    Population Stability Index between two histograms over the same bins.
+
+    Args:
+        ref_counts: Reference bin counts
+        new_counts: Current bin counts
+        eps: Floor for empty bins (avoids log(0))
+
+    Returns:
+        PSI value
+    """
+    p = np.maximum(np.asarray(ref_counts, dtype=float) / max(np.sum(ref_counts), 1), eps)
+    q = np.maximum(np.asarray(new_counts, dtype=float) / max(np.sum(new_counts), 1), eps)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(ref_counts: np.ndarray, new_counts: np.ndarray) -> float:
+    """
+    Kolmogorov-Smirnov statistic evaluated at the histogram bin edges.
+
+    Args:
+        ref_counts: Reference bin counts
+        new_counts: Current bin counts
+
+    Returns:
+        Maximum absolute difference between the two binned CDFs
+    """
+    ref_cdf = np.cumsum(ref_counts) / max(np.sum(ref_counts), 1)
+    new_cdf = np.cumsum(new_counts) / max(np.sum(new_counts), 1)
+    return float(np.max(np.abs(ref_cdf - new_cdf)))
+
+
+def build_reference_profile(df: pd.DataFrame,
+                             feature_cols: list = None,
+                             n_bins: int = 20) -> Dict:
+    """
+    Precompute compact reference histograms from the training data.
+
+    Args:
+        df: Master district DataFrame used for training (optionally with
+            predicted_risk_probability and predicted_high_risk)
+        feature_cols: Feature columns (if None, uses the model's default features)
+        n_bins: Number of quantile bins per feature
+
+    Returns:
+        Profile dictionary (JSON serialisable)
+    """
+    if feature_cols is None:
+        feature_cols = FEATURE_COLS
+
+    profile = {
+        'created_at': pd.Timestamp.now().isoformat(),
+        'n_rows': len(df),
+        'n_bins': n_bins,
+        'features': {
+            col: _reference_histogram(df[col].to_numpy(dtype=float), n_bins)
+            for col in feature_cols
+        }
+    }
+
+    if PREDICTION_COL in df.columns:
+        edges = np.linspace(0, 1, n_bins + 1)
+        profile['prediction'] = {
+            'edges': edges.tolist(),
+            'counts': _histogram(df[PREDICTION_COL].to_numpy(dtype=float), edges).tolist()
+        }
+
+    if HIGH_RISK_COL in df.columns:
+        profile['high_risk_set'] = _high_risk_districts(df)
+
+    return profile
+
+
+def save_profile(profile: Dict, filepath: str):
+    """
+    Save a reference profile to JSON.
+
+    Args:
+        profile: Output of build_reference_profile
+        filepath: Path to save profile (.json)
+    """
+    with open(filepath, 'w') as f:
+        json.dump(profile, f)
+    print(f"Reference profile saved: {filepath}")
+
+
+def load_profile(filepath: str) -> Dict:
+    """
+    Load a reference profile from JSON.
+
+    Args:
+        filepath: Path to profile file
+
+    Returns:
+        Profile dictionary
+    """
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def _status(value: float, warn: float, alert: float) -> str:
+    """Map a drift value to 'ok' / 'warn' / 'alert'."""
+    if value >= alert:
+        return 'alert'
+    if value >= warn:
+        return 'warn'
+    return 'ok'
+
+
+def _worst(*statuses: str) -> str:
+    """Most severe of several statuses."""
+    return max(statuses, key=STATUS_LEVELS.index)
+
+
+def check_drift(profile: Dict,
+                df: pd.DataFrame,
+                run_id: Optional[str] = None) -> pd.DataFrame:
+    """
+    Compare a new master table / prediction run against the reference profile.
+
+    Only the new data is binned (one searchsorted per feature), so each check
+    runs in milliseconds for district-level tables. Features are read as-is
+    (no median imputation): missing values are left out of the histograms and
+    the change in each feature's missing rate is checked separately.
+
+    Args:
+        profile: Output of build_reference_profile
+        df: New master district DataFrame (optionally with predictions)
+        run_id: Identifier of this refresh (default: current timestamp)
+
+    Returns:
+        DataFrame with one row per monitored metric and its status
+    """
+    if run_id is None:
+        run_id = pd.Timestamp.now().isoformat()
+
+    rows = []
+
+    for col, ref in profile['features'].items():
+        edges = np.asarray(ref['edges'])
+        values = df[col].to_numpy(dtype=float)
+        new_counts = _histogram(values, edges)
+        psi = population_stability_index(ref['counts'], new_counts)
+        ks = ks_statistic(ref['counts'], new_counts)
+        missing_rate = float(np.isnan(values).mean()) if len(values) else 0.0
+        missing_delta = abs(missing_rate - ref.get('missing_rate', 0.0))
+        rows.append({
+            'run_id': run_id, 'check': 'feature', 'name': col, 'psi': psi, 'ks': ks,
+            'missing_delta': missing_delta,
+            'status': _worst(_status(psi, PSI_WARN, PSI_ALERT), _status(ks, KS_WARN, KS_ALERT),
+                             _status(missing_delta, MISSING_WARN, MISSING_ALERT))
+        })
+
+    if 'prediction' in profile and PREDICTION_COL in df.columns:
+        ref = profile['prediction']
+        edges = np.asarray(ref['edges'])
+        new_counts = _histogram(df[PREDICTION_COL].to_numpy(dtype=float), edges)
+        psi = population_stability_index(ref['counts'], new_counts)
+        ks = ks_statistic(ref['counts'], new_counts)
+        rows.append({
+            'run_id': run_id, 'check': 'prediction', 'name': PREDICTION_COL, 'psi': psi, 'ks': ks,
+            'status': _worst(_status(psi, PSI_WARN, PSI_ALERT), _status(ks, KS_WARN, KS_ALERT))
+        })
+
+    # Churn of the model's own high-risk classification (not a top-K cut, which
+    # is decided by noise when many districts score close to 1)
+    if 'high_risk_set' in profile and HIGH_RISK_COL in df.columns:
+        ref_set = set(profile['high_risk_set'])
+        new_set = set(_high_risk_districts(df))
+        union = ref_set | new_set
+        churn = 1 - len(ref_set & new_set) / len(union) if union else 0.0
+        rows.append({
+            'run_id': run_id, 'check': 'high_risk_set', 'name': HIGH_RISK_COL,
+            'churn': churn,
+            'entered': len(new_set - ref_set),
+            'exited': len(ref_set - new_set),
+            'status': _status(churn, CHURN_WARN, CHURN_ALERT)
+        })
+
+    results = pd.DataFrame(rows, columns=['run_id', 'check', 'name', 'psi', 'ks', 'missing_delta',
+                                          'churn', 'entered', 'exited', 'status'])
+
+    n_alerts = (results['status'] == 'alert').sum()
+    if n_alerts > 0:
+        print(f"WARNING: {n_alerts} drift alerts: "
+              f"{', '.join(results.loc[results['status'] == 'alert', 'name'])}")
+
+    return results
+
+
+def append_drift_history(results: pd.DataFrame, filepath: str):
+    """
+    Append drift results to the monitoring time series (CSV).
+
+    Args:
+        results: Output of check_drift
+        filepath: Path of the history file (created with header if missing)
+    """
+    write_header = not os.path.exists(filepath)
+    results.to_csv(filepath, mode='a', header=write_header, index=False)
+    print(f"Drift history updated: {filepath}")
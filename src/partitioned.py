@@ -0,0 +1,330 @@
+"""
+Partitioned Execution Utilities
+Out-of-core execution of the district pipeline, split by state and date
+partition and run on a local process pool or a Dask cluster
+"""
+
+import argparse
+import glob
+import os
+import re
+import shutil
+import sys
+import tempfile
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, List, Optional, Tuple
+
+from .data_loader import (get_dataset_files, iter_parsed_chunks, load_dataset,
+                          clean_text_fields, remove_missing_critical_fields)
+from .deduplication import plan_shards, deduplicate_chunks
+from .feature_engineering import (add_enrolment_features, create_district_master,
+                                  merge_district_aggregates, calculate_exclusion_risk_score,
+                                  calculate_priority_score)
+from .model import predict_all_districts
+
+
+DATASETS = ['enrolment', 'demographic', 'biometric']
+ENROL_SUM_COLS = ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enrollments']
+DISTRICT_KEY = ['state', 'district']
+
+
+def _partition_slug(value) -> str:
+    """File-system safe partition name (collisions only merge work units)."""
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(value)).strip('_') or 'unknown'
+
+
+def partition_dataset(data_dir: str,
+                       dataset: str,
+                       work_dir: str,
+                       freq: str = 'M',
+                       chunksize: int = 500000) -> List[str]:
+    """
+    Stream one dataset into state/date partitions on disk.
+
+    Shards are read in chunks with the same deduplication, text cleaning and
+    missing-field removal as the single-process path, so memory is bounded by
+    one chunk. Each chunk is split by state and date period and written as
+    pickle part files (exact dtypes, no extra dependencies).
+
+    Args:
+        data_dir: Path to dataset directory
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        work_dir: Directory for partition files (shared storage on a cluster)
+        freq: Date partition frequency (pandas period alias)
+        chunksize: Rows read per chunk
+
+    Returns:
+        List of partition directories
+    """
+    dataset_dir = os.path.join(work_dir, dataset)
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+
+    plan = plan_shards(get_dataset_files(data_dir, dataset))
+
+    partitions = set()
+    part_no = 0
+    for _, chunk in deduplicate_chunks(iter_parsed_chunks(plan, chunksize)):
+        chunk = remove_missing_critical_fields(clean_text_fields(chunk))
+        periods = chunk['date'].dt.to_period(freq).astype(str)
+
+        for (state, period), part in chunk.groupby([chunk['state'], periods], sort=False):
+            path = os.path.join(dataset_dir, f"state={_partition_slug(state)}", f"period={period}")
+            os.makedirs(path, exist_ok=True)
+            part.to_pickle(os.path.join(path, f"part-{part_no:06d}.pkl"))
+            partitions.add(path)
+            part_no += 1
+
+    return sorted(partitions)
+
+
+def aggregate_partition(dataset: str, partition_dir: str) -> Dict:
+    """
+    Compute the partial district aggregates of one partition.
+
+    Args:
+        dataset: One of 'enrolment', 'demographic', 'biometric'
+        partition_dir: Directory written by partition_dataset
+
+    Returns:
+        Partial aggregate dictionary (see combine_partials)
+    """
+    files = sorted(glob.glob(os.path.join(partition_dir, '*.pkl')))
+    df = pd.concat([pd.read_pickle(f) for f in files], ignore_index=True)
+
+    if dataset == 'enrolment':
+        df = add_enrolment_features(df)
+        return {
+            'enrol_sums': df.groupby(DISTRICT_KEY)[ENROL_SUM_COLS].sum(),
+            'enrol_pincodes': df[DISTRICT_KEY + ['pincode']].drop_duplicates()
+        }
+
+    count_col = 'demo_update_count' if dataset == 'demographic' else 'bio_update_count'
+    return {count_col: df.groupby(DISTRICT_KEY).size().rename(count_col)}
+
+
+def combine_partials(a: Dict, b: Dict) -> Dict:
+    """
+    Combine two partial aggregates (associative and commutative).
+
+    Sums are added per district and distinct pincodes are unioned, so
+    partials can be merged in any order or as a tree.
+
+    Args:
+        a: Partial aggregate
+        b: Partial aggregate
+
+    Returns:
+        Combined partial aggregate
+    """
+    combined = dict(a)
+    for key, value in b.items():
+        if key not in combined:
+            combined[key] = value
+        elif key == 'enrol_pincodes':
+            combined[key] = pd.concat([combined[key], value]).drop_duplicates()
+        else:
+            combined[key] = pd.concat([combined[key], value]).groupby(level=[0, 1]).sum()
+    return combined
+
+
+def finalize_master(partial: Dict) -> pd.DataFrame:
+    """
+    Turn the fully combined aggregate into the master district table.
+
+    Args:
+        partial: Result of combining all partition aggregates
+
+    Returns:
+        Master district DataFrame (same as create_district_master)
+    """
+    enrol_district = partial['enrol_sums'].sort_index().reset_index()
+    pincode_count = partial['enrol_pincodes'].groupby(DISTRICT_KEY)['pincode'].nunique()
+    enrol_district['pincode_count'] = pincode_count.reindex(
+        pd.MultiIndex.from_frame(enrol_district[DISTRICT_KEY])).to_numpy()
+
+    def district_counts(col: str) -> pd.DataFrame:
+        if col in partial:
+            return partial[col].sort_index().reset_index()
+        return pd.DataFrame({'state': pd.Series(dtype=object),
+                             'district': pd.Series(dtype=object),
+                             col: pd.Series(dtype='int64')})
+
+    return merge_district_aggregates(enrol_district,
+                                     district_counts('demo_update_count'),
+                                     district_counts('bio_update_count'))
+
+
+def make_executor(kind: str = 'process', n_workers: Optional[int] = None):
+    """
+    Create an executor for partition tasks.
+
+    Args:
+        kind: 'process' for a local process pool, 'dask' for a local Dask cluster
+        n_workers: Number of workers (if None, uses all CPUs)
+
+    Returns:
+        Executor with submit(); a dask.distributed.Client for 'dask'
+    """
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=n_workers)
+    if kind == 'dask':
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError:
+            raise ImportError("kind='dask' requires dask[distributed] (pip install 'dask[distributed]')")
+        return Client(LocalCluster(n_workers=n_workers, processes=True))
+    raise ValueError(f"Unknown executor kind '{kind}', expected 'process' or 'dask'")
+
+
+def create_district_master_partitioned(data_dir: str,
+                                        work_dir: str,
+                                        executor=None,
+                                        freq: str = 'M',
+                                        chunksize: int = 500000) -> pd.DataFrame:
+    """
+    Build the master district table with partitioned, out-of-core execution.
+
+    Each (dataset, state, period) partition is aggregated as a separate task
+    on the executor; partials are combined associatively on the driver and
+    finalized with the same code as create_district_master, so the result
+    matches the single-process path exactly.
+
+    Args:
+        data_dir: Path to dataset directory
+        work_dir: Directory for partition files (shared storage on a cluster)
+        executor: Object with submit() returning futures with result(), e.g. a
+                  ProcessPoolExecutor or dask.distributed.Client (if None, uses
+                  a local process pool)
+        freq: Date partition frequency (pandas period alias)
+        chunksize: Rows read per chunk while partitioning
+
+    Returns:
+        Master district DataFrame
+    """
+    tasks: List[Tuple[str, str]] = []
+    for dataset in DATASETS:
+        print(f"Partitioning {dataset} data...")
+        tasks += [(dataset, p) for p in partition_dataset(data_dir, dataset, work_dir,
+                                                          freq=freq, chunksize=chunksize)]
+    print(f"Aggregating {len(tasks):,} partitions...")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = make_executor('process')
+    try:
+        futures = [executor.submit(aggregate_partition, dataset, path) for dataset, path in tasks]
+        partials = [f.result() for f in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return finalize_master(reduce(combine_partials, partials, {}))
+
+
+def run_partitioned_pipeline(data_dir: str,
+                              work_dir: str,
+                              model=None,
+                              scaler=None,
+                              feature_cols: list = None,
+                              executor=None,
+                              freq: str = 'M',
+                              chunksize: int = 500000) -> pd.DataFrame:
+    """
+    Run the full pipeline (load -> master -> predict -> priority) partitioned.
+
+    The record-level stages are partitioned; risk scoring, prediction and
+    priority scoring run once on the combined district table because they
+    use global statistics (min/max scaling, medians).
+
+    Args:
+        data_dir: Path to dataset directory
+        work_dir: Directory for partition files
+        model: Trained model (if None, priority falls back to exclusion_risk_score)
+        scaler: Fitted scaler
+        feature_cols: Feature columns used in training
+        executor: Executor for partition tasks (see create_district_master_partitioned)
+        freq: Date partition frequency
+        chunksize: Rows read per chunk
+
+    Returns:
+        Prioritised district DataFrame
+    """
+    df = create_district_master_partitioned(data_dir, work_dir, executor=executor,
+                                            freq=freq, chunksize=chunksize)
+    df = calculate_exclusion_risk_score(df)
+    if model is not None:
+        df = predict_all_districts(df, model, scaler, feature_cols)
+    return calculate_priority_score(df)
+
+
+def verify_partitioned_master(data_dir: str,
+                               work_dir: str,
+                               freq: str = 'M',
+                               executor=None,
+                               chunksize: int = 500000) -> pd.DataFrame:
+    """
+    Check that the partitioned master table equals the single-process one.
+
+    Builds the master table both ways from the same shards and compares them
+    with pandas' assert_frame_equal (exact values, dtypes and row order).
+
+    Args:
+        data_dir: Path to dataset directory
+        work_dir: Directory for partition files
+        freq: Date partition frequency
+        executor: Executor for partition tasks (see create_district_master_partitioned)
+        chunksize: Rows read per chunk
+
+    Returns:
+        The (identical) master district DataFrame
+
+    Raises:
+        AssertionError: If the two results differ
+    """
+    frames = {}
+    for dataset in DATASETS:
+        df = load_dataset(data_dir, dataset, chunksize=chunksize)
+        frames[dataset] = remove_missing_critical_fields(clean_text_fields(df))
+    expected = create_district_master(add_enrolment_features(frames['enrolment']),
+                                      frames['demographic'], frames['biometric'])
+
+    result = create_district_master_partitioned(data_dir, work_dir, executor=executor,
+                                                freq=freq, chunksize=chunksize)
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_exact=True)
+    print(f"Partitioned master matches single-process master (freq={freq}, {len(result):,} districts)")
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check that partitioned execution reproduces the single-process master table.')
+    parser.add_argument('--data-dir', default='dataset', help='Path to dataset directory')
+    parser.add_argument('--work-dir', default=None, help='Partition directory (default: temporary)')
+    parser.add_argument('--freq', nargs='+', default=['M', 'D'], help='Date partition frequencies')
+    parser.add_argument('--executor', default='process', choices=['process', 'dask'])
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes')
+    args = parser.parse_args(argv)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='partitions-')
+    executor = make_executor(args.executor, args.jobs)
+    try:
+        for freq in args.freq:
+            verify_partitioned_master(args.data_dir, work_dir, freq=freq, executor=executor)
+    finally:
+        if args.executor == 'dask':
+            executor.close()
+        else:
+            executor.shutdown()
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    # Re-import under the package name so worker processes can unpickle tasks
+    import importlib
+    sys.exit(importlib.import_module(__spec__.name).main())
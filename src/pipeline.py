@@ -0,0 +1,423 @@
+"""
+Pipeline Runner
+Run the notebook pipeline (data preparation -> modeling -> intervention ->
+charts) as a cached DAG of stages from the command line
+
+Usage:
+    python -m src.pipeline --data-dir dataset --output-dir outputs
+    python -m src.pipeline --force train_model --jobs 4
+    python -m src.pipeline --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ---------------------------------------------------------------------------
+# Stage implementations (run inside worker processes; heavy imports are local)
+# ---------------------------------------------------------------------------
+
+def _stage_load(inputs: Dict, config: Dict, dataset: str):
+    from .data_loader import load_dataset, clean_text_fields, remove_missing_critical_fields
+    from .feature_engineering import add_enrolment_features
+
+    df = load_dataset(config['data_dir'], dataset)
+    df = remove_missing_critical_fields(clean_text_fields(df))
+    if dataset == 'enrolment':
+        df = add_enrolment_features(df)
+    return df, []
+
+
+def _stage_master(inputs: Dict, config: Dict):
+    from .feature_engineering import create_district_master, calculate_exclusion_risk_score
+
+    df = create_district_master(inputs['load_enrolment'], inputs['load_demographic'],
+                                inputs['load_biometric'])
+    df = calculate_exclusion_risk_score(df)
+
+    path = os.path.join(config['output_dir'], 'tables', 'master_district_data.csv')
+    df.to_csv(path, index=False)
+    return df, [path]
+
+
+def _stage_train_model(inputs: Dict, config: Dict):
+    import pandas as pd
+    from .model import prepare_features, train_exclusion_model
+    from .registry import register_model, VERSIONS_DIR, BUNDLE_FILE, MANIFEST_FILE
+
+    X, y = prepare_features(inputs['master'])
+    result = train_exclusion_model(X, y, random_state=config['random_state'])
+    version = register_model(config['registry_dir'], result['model'], result['scaler'],
+                             result['feature_cols'], result['metrics'], df_train=X, promote=True)
+
+    row = {'version': version}
+    row.update({k: float(v) for k, v in result['metrics'].items()})
+
+    # The cached row only names the version; its registry files must still exist
+    version_dir = os.path.join(config['registry_dir'], VERSIONS_DIR, version)
+    artifacts = [os.path.join(version_dir, MANIFEST_FILE), os.path.join(version_dir, BUNDLE_FILE)]
+    return pd.DataFrame([row]), artifacts
+
+
+def _stage_priority(inputs: Dict, config: Dict):
+    from .registry import load_model_version
+    from .model import predict_all_districts
+    from .feature_engineering import calculate_priority_score
+
+    bundle = load_model_version(config['registry_dir'], inputs['train_model']['version'].iloc[0])
+    df = predict_all_districts(inputs['master'], bundle['model'], bundle['scaler'],
+                               bundle['feature_cols'])
+    return calculate_priority_score(df), []
+
+
+def _stage_top_districts(inputs: Dict, config: Dict):
+    df = inputs['priority'].sort_values('priority_score', ascending=False).head(config['top_n'])
+
+    path = os.path.join(config['output_dir'], 'tables', '04_top100_priority_districts.csv')
+    df.to_csv(path, index=False)
+    return df, [path]
+
+
+def _stage_charts(inputs: Dict, config: Dict):
+    import warnings
+    import pandas as pd
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    warnings.filterwarnings('ignore', message='.*non-interactive.*')
+    import matplotlib.pyplot as plt
+    from . import visualization as viz
+
+    figures = os.path.join(config['output_dir'], 'figures')
+    dashboard = os.path.join(config['output_dir'], 'dashboard')
+    os.makedirs(dashboard, exist_ok=True)
+    df = inputs['master']
+
+    artifacts = [
+        os.path.join(figures, '01_top_states_enrollment.png'),
+        os.path.join(figures, '01_age_distribution.png'),
+        os.path.join(dashboard, '02_exclusion_risk_map.html'),
+    ]
+    viz.plot_enrollment_by_state(df, save_path=artifacts[0])
+    plt.close('all')
+    viz.plot_age_distribution_pie(df, save_path=artifacts[1])
+    plt.close('all')
+    viz.create_interactive_risk_map(df, artifacts[2])
+
+    return pd.DataFrame({'artifact': artifacts}), artifacts
+
+
+# Stage DAG: dependencies, config keys and src modules that feed each cache key
+STAGES = {
+    'load_enrolment': {
+        'func': _stage_load, 'kwargs': {'dataset': 'enrolment'}, 'deps': [],
+        'raw_data': 'enrolment', 'params': ['data_dir'],
+        'modules': ['data_loader', 'data_quality', 'deduplication', 'feature_engineering']
+    },
+    'load_demographic': {
+        'func': _stage_load, 'kwargs': {'dataset': 'demographic'}, 'deps': [],
+        'raw_data': 'demographic', 'params': ['data_dir'],
+        'modules': ['data_loader', 'data_quality', 'deduplication']
+    },
+    'load_biometric': {
+        'func': _stage_load, 'kwargs': {'dataset': 'biometric'}, 'deps': [],
+        'raw_data': 'biometric', 'params': ['data_dir'],
+        'modules': ['data_loader', 'data_quality', 'deduplication']
+    },
+    'master': {
+        'func': _stage_master, 'deps': ['load_enrolment', 'load_demographic', 'load_biometric'],
+        'params': ['output_dir'], 'modules': ['feature_engineering']
+    },
+    'train_model': {
+        'func': _stage_train_model, 'deps': ['master'],
+        'params': ['registry_dir', 'random_state'], 'modules': ['model', 'registry']
+    },
+    'priority': {
+        'func': _stage_priority, 'deps': ['master', 'train_model'],
+        'params': ['registry_dir'], 'modules': ['model', 'registry', 'feature_engineering']
+    },
+    'top_districts': {
+        'func': _stage_top_districts, 'deps': ['priority'],
+        'params': ['output_dir', 'top_n'], 'modules': []
+    },
+    'charts': {
+        'func': _stage_charts, 'deps': ['master'],
+        'params': ['output_dir'], 'modules': ['visualization']
+    },
+}
+
+# Bump to invalidate every cached stage (e.g. after changing the runner itself)
+CACHE_FORMAT_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Cache keys and storage
+# ---------------------------------------------------------------------------
+
+def _module_hash(module: str, memo: Dict[str, str]) -> str:
+    """Content hash of a src module (memoised per run)."""
+    if module not in memo:
+        with open(os.path.join(SRC_DIR, f'{module}.py'), 'rb') as f:
+            memo[module] = hashlib.sha256(f.read()).hexdigest()
+    return memo[module]
+
+
+def _raw_data_fingerprint(data_dir: str, dataset: str) -> str:
+    """
+    Fingerprint raw shards by path, size and modification time.
+
+    Stat-based so that checking large CSVs costs no reads; any re-download or
+    edit changes the fingerprint.
+    """
+    folder = os.path.join(data_dir, f'api_data_aadhar_{dataset}')
+    entries = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith('.csv'):
+                stat = os.stat(os.path.join(root, name))
+                entries.append(f"{os.path.relpath(os.path.join(root, name), folder)}|"
+                               f"{stat.st_size}|{stat.st_mtime_ns}")
+    return hashlib.sha256('\n'.join(sorted(entries)).encode()).hexdigest()
+
+
+def compute_stage_keys(config: Dict) -> Dict[str, str]:
+    """
+    Compute the cache key of every stage.
+
+    A key hashes the stage's parameters, the source of the modules it uses,
+    its raw input fingerprint and the keys of its dependencies, so changing
+    anything upstream invalidates all downstream stages.
+
+    Args:
+        config: Runner configuration
+
+    Returns:
+        Dictionary of stage name -> key
+    """
+    keys, memo = {}, {}
+    for name in _topological_order():
+        stage = STAGES[name]
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}|{name}|{_module_hash('pipeline', memo)}".encode())
+        digest.update(json.dumps({p: config[p] for p in stage['params']}, sort_keys=True).encode())
+        for module in stage['modules']:
+            digest.update(_module_hash(module, memo).encode())
+        if 'raw_data' in stage:
+            digest.update(_raw_data_fingerprint(config['data_dir'], stage['raw_data']).encode())
+        for dep in stage['deps']:
+            digest.update(keys[dep].encode())
+        keys[name] = digest.hexdigest()[:16]
+    return keys
+
+
+def _topological_order() -> List[str]:
+    """Stage names ordered so every dependency comes first."""
+    order, visiting = [], set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Cycle in pipeline stages at '{name}'")
+        visiting.add(name)
+        for dep in STAGES[name]['deps']:
+            visit(dep)
+        order.append(name)
+
+    for name in STAGES:
+        visit(name)
+    return order
+
+
+def _cache_paths(cache_dir: str, name: str, key: str) -> Dict[str, str]:
+    base = os.path.join(cache_dir, name, key)
+    return {'data': f'{base}.parquet', 'meta': f'{base}.json'}
+
+
+def is_cached(cache_dir: str, name: str, key: str) -> bool:
+    """
+    Check whether a stage output (and its exported artifacts) is up to date.
+
+    Args:
+        cache_dir: Cache directory
+        name: Stage name
+        key: Stage cache key
+
+    Returns:
+        True if the stage can be skipped
+    """
+    paths = _cache_paths(cache_dir, name, key)
+    if not (os.path.exists(paths['meta']) and os.path.exists(paths['data'])):
+        return False
+    with open(paths['meta']) as f:
+        meta = json.load(f)
+    return all(os.path.exists(p) for p in meta.get('artifacts', []))
+
+
+def _run_stage(name: str, key: str, config: Dict, input_paths: Dict[str, str]) -> Dict:
+    """Execute one stage in a worker and write its output to the cache atomically."""
+    import pandas as pd
+
+    start = time.perf_counter()
+    inputs = {dep: pd.read_parquet(path) for dep, path in input_paths.items()}
+    stage = STAGES[name]
+    df, artifacts = stage['func'](inputs, config, **stage.get('kwargs', {}))
+
+    paths = _cache_paths(config['cache_dir'], name, key)
+    os.makedirs(os.path.dirname(paths['data']), exist_ok=True)
+    tmp = f"{paths['data']}.tmp-{uuid.uuid4().hex[:8]}"
+    df.reset_index(drop=True).to_parquet(tmp, index=False)
+    os.replace(tmp, paths['data'])
+
+    meta = {
+        'stage': name,
+        'key': key,
+        'rows': len(df),
+        'artifacts': artifacts,
+        'runtime_seconds': time.perf_counter() - start,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+    tmp = f"{paths['meta']}.tmp-{uuid.uuid4().hex[:8]}"
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, paths['meta'])
+
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def run_pipeline(config: Dict,
+                 force: Optional[List[str]] = None,
+                 jobs: Optional[int] = None,
+                 dry_run: bool = False) -> Dict[str, str]:
+    """
+    Run all stages whose cache key is not yet stored.
+
+    Independent stages (e.g. chart rendering and model training) run
+    concurrently in a process pool. Stages listed in force (or 'all') rerun
+    regardless of the cache, together with everything downstream of them.
+
+    Args:
+        config: Runner configuration (see build_config)
+        force: Stage names to rerun regardless of the cache
+        jobs: Worker processes (if None, uses all CPUs)
+        dry_run: Only report which stages would run
+
+    Returns:
+        Dictionary of stage name -> 'cached' / 'ran' / 'pending'
+    """
+    force = set(force or [])
+    unknown = force - set(STAGES) - {'all'}
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}; expected {list(STAGES)}")
+
+    keys = compute_stage_keys(config)
+    status = {}
+    for name in _topological_order():
+        forced = 'all' in force or name in force
+        if any(status[d] == 'pending' for d in STAGES[name]['deps']):
+            forced = True
+        cached = not forced and is_cached(config['cache_dir'], name, keys[name])
+        status[name] = 'cached' if cached else 'pending'
+
+    pending = [n for n in _topological_order() if status[n] == 'pending']
+    if dry_run or not pending:
+        for name in _topological_order():
+            print(f"  {name:<18} {status[name]:<8} {keys[name]}")
+        if not pending:
+            print("Nothing to do: all stages are cached")
+        return status
+
+    for d in ('tables', 'figures'):
+        os.makedirs(os.path.join(config['output_dir'], d), exist_ok=True)
+
+    running = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            ready = [n for n in pending
+                     if all(status[d] in ('cached', 'ran') for d in STAGES[n]['deps'])]
+            for name in ready:
+                inputs = {d: _cache_paths(config['cache_dir'], d, keys[d])['data']
+                          for d in STAGES[name]['deps']}
+                print(f"Running stage: {name}")
+                running[pool.submit(_run_stage, name, keys[name], config, inputs)] = name
+                pending.remove(name)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                meta = future.result()
+                status[name] = 'ran'
+                print(f"Finished stage: {name} ({meta['runtime_seconds']:.1f}s, {meta['rows']:,} rows)")
+
+    return status
+
+
+def build_config(data_dir: str = 'dataset',
+                 output_dir: str = 'outputs',
+                 cache_dir: Optional[str] = None,
+                 registry_dir: Optional[str] = None,
+                 top_n: int = 100,
+                 random_state: int = 42) -> Dict:
+    """
+    Build the runner configuration (paths are made absolute).
+
+    Args:
+        data_dir: Path to dataset directory
+        output_dir: Path to outputs directory
+        cache_dir: Stage cache directory (default: <output_dir>/cache)
+        registry_dir: Model registry directory (default: <output_dir>/models)
+        top_n: Number of priority districts exported
+        random_state: Random seed for model training
+
+    Returns:
+        Configuration dictionary
+    """
+    output_dir = os.path.abspath(output_dir)
+    return {
+        'data_dir': os.path.abspath(data_dir),
+        'output_dir': output_dir,
+        'cache_dir': os.path.abspath(cache_dir or os.path.join(output_dir, 'cache')),
+        'registry_dir': os.path.abspath(registry_dir or os.path.join(output_dir, 'models')),
+        'top_n': top_n,
+        'random_state': random_state
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the Aadhaar exclusion pipeline with stage caching.')
+    parser.add_argument('--data-dir', default='dataset', help='Path to dataset directory')
+    parser.add_argument('--output-dir', default='outputs', help='Path to outputs directory')
+    parser.add_argument('--cache-dir', default=None, help='Stage cache directory')
+    parser.add_argument('--registry-dir', default=None, help='Model registry directory')
+    parser.add_argument('--top-n', type=int, default=100, help='Number of priority districts exported')
+    parser.add_argument('--random-state', type=int, default=42, help='Random seed for model training')
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE',
+                        help=f"Stages to rerun ('all' or any of: {', '.join(STAGES)})")
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes')
+    parser.add_argument('--dry-run', action='store_true', help='Only show which stages would run')
+    args = parser.parse_args(argv)
+
+    config = build_config(args.data_dir, args.output_dir, args.cache_dir, args.registry_dir,
+                          args.top_n, args.random_state)
+    start = time.perf_counter()
+    run_pipeline(config, force=args.force, jobs=args.jobs, dry_run=args.dry_run)
+    print(f"Pipeline finished in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    # Re-import under the package name so worker processes can unpickle stages
+    import importlib
+    sys.exit(importlib.import_module(__spec__.name).main())
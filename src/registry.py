@@ -0,0 +1,311 @@
+"""
+Model Registry Utilities
+Versioned, file-based storage of trained exclusion risk models with atomic
+promotion and hot reload for long-running scorers
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import joblib
+import pandas as pd
+from typing import Dict, List, Optional
+
+from .model import predict_all_districts
+
+
+VERSIONS_DIR = 'versions'
+CURRENT_POINTER = 'CURRENT'
+BUNDLE_FILE = 'bundle.joblib'
+MANIFEST_FILE = 'manifest.json'
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint a training DataFrame (columns and row contents).
+
+    Args:
+        df: Training DataFrame
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update('|'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _file_sha256(filepath: str) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(filepath: str, text: str):
+    """Write a small text file via a temporary file and atomic rename."""
+    tmp = f"{filepath}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+
+
+def list_versions(registry_dir: str) -> List[str]:
+    """
+    List registered model versions, oldest first.
+
+    Args:
+        registry_dir: Registry root directory
+
+    Returns:
+        List of version ids ('v0001', 'v0002', ...)
+    """
+    versions_dir = os.path.join(registry_dir, VERSIONS_DIR)
+    if not os.path.isdir(versions_dir):
+        return []
+    versions = [v for v in os.listdir(versions_dir) if v.startswith('v') and v[1:].isdigit()]
+    return sorted(versions, key=lambda v: int(v[1:]))
+
+
+def register_model(registry_dir: str,
+                    model,
+                    scaler,
+                    feature_cols: list,
+                    metrics: Dict,
+                    df_train: Optional[pd.DataFrame] = None,
+                    promote: bool = False) -> str:
+    """
+    Store a trained model, its scaler and metadata as a new registry version.
+
+    The version is assembled in a temporary directory and renamed into place,
+    so a partially written version is never visible.
+
+    Args:
+        registry_dir: Registry root directory
+        model: Trained model
+        scaler: Scaler fitted in the same training run
+        feature_cols: Feature columns the model was trained on
+        metrics: Evaluation metrics (e.g. train_exclusion_model()['metrics'])
+        df_train: Training data used to compute a data fingerprint
+        promote: Whether to make this version current immediately
+
+    Returns:
+        New version id
+    """
+    versions_dir = os.path.join(registry_dir, VERSIONS_DIR)
+    os.makedirs(versions_dir, exist_ok=True)
+
+    run_id = uuid.uuid4().hex
+    staging = os.path.join(versions_dir, f".staging-{run_id}")
+    os.makedirs(staging)
+
+    bundle_path = os.path.join(staging, BUNDLE_FILE)
+    joblib.dump({
+        'model': model,
+        'scaler': scaler,
+        'feature_cols': list(feature_cols),
+        'run_id': run_id
+    }, bundle_path)
+
+    manifest = {
+        'run_id': run_id,
+        'created_at': pd.Timestamp.now().isoformat(),
+        'model_type': type(model).__name__,
+        'feature_cols': list(feature_cols),
+        'metrics': {k: float(v) for k, v in metrics.items()},
+        'data_fingerprint': data_fingerprint(df_train) if df_train is not None else None,
+        'bundle_sha256': _file_sha256(bundle_path)
+    }
+
+    # Claim the next version number; retry if another process took it first
+    while True:
+        existing = list_versions(registry_dir)
+        version = f"v{int(existing[-1][1:]) + 1 if existing else 1:04d}"
+        manifest['version'] = version
+        with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        try:
+            os.rename(staging, os.path.join(versions_dir, version))
+            break
+        except OSError:
+            if not os.path.exists(os.path.join(versions_dir, version)):
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+    print(f"Model registered: {version}")
+
+    if promote:
+        promote_model(registry_dir, version)
+
+    return version
+
+
+def promote_model(registry_dir: str, version: str):
+    """
+    Atomically make a version the current one.
+
+    Args:
+        registry_dir: Registry root directory
+        version: Version id to promote
+    """
+    if version not in list_versions(registry_dir):
+        raise ValueError(f"Unknown model version '{version}'")
+
+    _write_atomic(os.path.join(registry_dir, CURRENT_POINTER), version)
+    print(f"Model promoted: {version}")
+
+
+def get_current_version(registry_dir: str) -> Optional[str]:
+    """
+    Read the currently promoted version.
+
+    Args:
+        registry_dir: Registry root directory
+
+    Returns:
+        Version id, or None if nothing has been promoted
+    """
+    try:
+        with open(os.path.join(registry_dir, CURRENT_POINTER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_manifest(registry_dir: str, version: str) -> Dict:
+    """
+    Load the manifest of a registered version.
+
+    Args:
+        registry_dir: Registry root directory
+        version: Version id
+
+    Returns:
+        Manifest dictionary
+    """
+    with open(os.path.join(registry_dir, VERSIONS_DIR, version, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def load_model_version(registry_dir: str, version: Optional[str] = None) -> Dict:
+    """
+    Load and verify a registered model bundle.
+
+    Checks that the bundle file matches its manifest checksum, that model and
+    scaler come from the same training run and that the scaler expects the
+    recorded feature columns.
+
+    Args:
+        registry_dir: Registry root directory
+        version: Version id (if None, loads the current version)
+
+    Returns:
+        Dictionary with model, scaler, feature_cols, version and manifest
+    """
+    if version is None:
+        version = get_current_version(registry_dir)
+        if version is None:
+            raise ValueError(f"No model has been promoted in '{registry_dir}'")
+
+    manifest = load_manifest(registry_dir, version)
+    bundle_path = os.path.join(registry_dir, VERSIONS_DIR, version, BUNDLE_FILE)
+
+    if _file_sha256(bundle_path) != manifest['bundle_sha256']:
+        raise ValueError(f"Model version '{version}' is corrupted (checksum mismatch)")
+
+    bundle = joblib.load(bundle_path)
+    if bundle['run_id'] != manifest['run_id']:
+        raise ValueError(f"Model version '{version}' bundle does not match its manifest")
+    if getattr(bundle['scaler'], 'n_features_in_', len(bundle['feature_cols'])) != len(bundle['feature_cols']):
+        raise ValueError(f"Model version '{version}' scaler does not match its feature columns")
+
+    return {
+        'model': bundle['model'],
+        'scaler': bundle['scaler'],
+        'feature_cols': bundle['feature_cols'],
+        'version': version,
+        'manifest': manifest
+    }
+
+
+class ModelScorer:
+    """
+    Long-running scorer that follows the registry's current version.
+
+    Each call checks the CURRENT pointer (at most once per check_interval
+    seconds). A newly promoted version is loaded and verified before the
+    lock is taken, and only the reference swap happens under it, so requests
+    already in flight finish on the old version and none are dropped. If the
+    new version fails to load, the scorer keeps serving the old one.
+    """
+
+    def __init__(self, registry_dir: str, check_interval: float = 1.0):
+        self.registry_dir = registry_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._bundle = load_model_version(registry_dir)
+        self._last_check = time.monotonic()
+
+    @property
+    def version(self) -> str:
+        return self._bundle['version']
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the model if a different version has been promoted.
+
+        Args:
+            force: Check the pointer even if check_interval has not elapsed
+
+        Returns:
+            True if a new version was loaded
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        current = get_current_version(self.registry_dir)
+        if current is None or current == self._bundle['version']:
+            return False
+
+        # Load and verify without holding the lock; only the swap is serialised
+        try:
+            bundle = load_model_version(self.registry_dir, current)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not load model {current}, keeping {self.version}: {e}")
+            return False
+
+        with self._lock:
+            # Another caller may have swapped first, or the pointer moved on meanwhile
+            if current == self._bundle['version'] or get_current_version(self.registry_dir) != current:
+                return False
+            self._bundle = bundle
+
+        print(f"Model reloaded: {current}")
+        return True
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score districts with the current model version.
+
+        Args:
+            df: Master district DataFrame
+
+        Returns:
+            DataFrame with prediction columns and the model_version used
+        """
+        self.refresh()
+        bundle = self._bundle
+        df = predict_all_districts(df, bundle['model'], bundle['scaler'], bundle['feature_cols'])
+        df['model_version'] = bundle['version']
+        return df
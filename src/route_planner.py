@@ -0,0 +1,403 @@
+"""
+MEU Route Planning Utilities
+Plan capacity-constrained Mobile Enrolment Unit (MEU) coverage and routes
+over the ranked priority districts
+"""
+
+import json
+import time
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from typing import Dict, List, Optional
+
+
+# Deployment assumptions (same as the intervention strategy notebook)
+OPERATIONAL_DAYS_PER_MEU = 30          # 1 month deployment
+DAILY_ENROLLMENT_TARGET = 150          # 150 enrollments/day per MEU
+TRAVEL_KM_PER_DAY = 120                # Road distance an MEU covers in one travel day
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _to_unit_sphere(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Convert lat/lon in degrees to 3D unit vectors (chord distance is monotone in arc distance)."""
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    return np.column_stack([
+        np.cos(lat_r) * np.cos(lon_r),
+        np.cos(lat_r) * np.sin(lon_r),
+        np.sin(lat_r)
+    ])
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in km (vectorised, broadcasts like numpy).
+
+    Args:
+        lat1, lon1: Origin coordinates in degrees
+        lat2, lon2: Destination coordinates in degrees
+
+    Returns:
+        Array of distances in km
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def build_target_pincodes(df_priority: pd.DataFrame,
+                           df_pincodes: pd.DataFrame,
+                           top_n: Optional[int] = None,
+                           daily_target: int = DAILY_ENROLLMENT_TARGET) -> pd.DataFrame:
+    """
+    Expand the ranked district list into pincode-level stops.
+
+    Args:
+        df_priority: Output of calculate_priority_score (state, district, priority_score)
+        df_pincodes: Pincode centroids with state, district, pincode, latitude, longitude
+                     and an optional 'demand' column (expected enrolments at the pincode)
+        top_n: Only keep pincodes of the top N districts (if None, keeps all)
+        daily_target: Enrolments one MEU completes per day
+
+    Returns:
+        DataFrame of stops sorted by priority with service_days per stop
+    """
+    ranked = df_priority.sort_values('priority_score', ascending=False)
+    if top_n is not None:
+        ranked = ranked.head(top_n)
+    ranked = ranked[['state', 'district', 'priority_score']]
+
+    stops = df_pincodes.merge(ranked, on=['state', 'district'], how='inner')
+    stops = stops.dropna(subset=['latitude', 'longitude'])
+
+    if 'demand' not in stops.columns:
+        stops['demand'] = daily_target
+    stops['service_days'] = np.maximum(np.ceil(stops['demand'] / daily_target), 1)
+
+    stops = stops.sort_values('priority_score', ascending=False, kind='stable')
+    return stops.reset_index(drop=True)
+
+
+def _two_opt(route: np.ndarray, coords: np.ndarray, max_passes: int = 20) -> np.ndarray:
+    """
+    Improve an open route (fixed start) with 2-opt segment reversals.
+
+    Args:
+        route: Stop indices in visiting order
+        coords: (n, 2) array of lat/lon for all stops
+        max_passes: Maximum number of improvement sweeps
+
+    Returns:
+        Improved route
+    """
+    n = len(route)
+    if n < 4:
+        return route
+
+    pts = coords[route]
+    dist = haversine_km(pts[:, None, 0], pts[:, None, 1], pts[None, :, 0], pts[None, :, 1])
+    order = np.arange(n)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = order[i - 1], order[i]
+            j = np.arange(i + 1, n)
+            c = order[j]
+            # Edge after c (open route: reversing up to the last stop removes no edge)
+            d = np.where(j + 1 < n, order[np.minimum(j + 1, n - 1)], -1)
+            has_next = d >= 0
+            d_safe = np.where(has_next, d, 0)
+            delta = (dist[a, c] - dist[a, b] +
+                     np.where(has_next, dist[b, d_safe] - dist[c, d_safe], 0.0))
+            k = np.argmin(delta)
+            if delta[k] < -1e-9:
+                order[i:j[k] + 1] = order[i:j[k] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+
+    return route[order]
+
+
+def _route_length_km(route: np.ndarray, coords: np.ndarray) -> float:
+    """Total travelled distance of an open route in km."""
+    if len(route) < 2:
+        return 0.0
+    pts = coords[route]
+    return float(haversine_km(pts[:-1, 0], pts[:-1, 1], pts[1:, 0], pts[1:, 1]).sum())
+
+
+def plan_meu_routes(stops: pd.DataFrame,
+                     n_meus: int,
+                     days_per_meu: float = OPERATIONAL_DAYS_PER_MEU,
+                     km_per_day: float = TRAVEL_KM_PER_DAY,
+                     neighbours: int = 16,
+                     improve: bool = True) -> Dict:
+    """
+    Assign stops to MEUs and route them under a per-MEU day budget.
+
+    Greedy construction: each MEU is seeded at the highest-priority uncovered
+    pincode and repeatedly moves to the nearby uncovered pincode with the best
+    priority per day (travel + service) that still fits its budget. Routes are
+    then shortened with 2-opt, which never breaks the capacity constraint.
+
+    Args:
+        stops: Output of build_target_pincodes
+        n_meus: Number of MEUs available
+        days_per_meu: Working days available to each MEU
+        km_per_day: Travel distance that costs one day
+        neighbours: Nearest-neighbour candidates examined per step
+        improve: Whether to run the 2-opt improvement phase
+
+    Returns:
+        Dictionary with routes (list of stop index arrays) and quality statistics
+    """
+    n = len(stops)
+    coords = stops[['latitude', 'longitude']].to_numpy(dtype=float)
+    priority = stops['priority_score'].to_numpy(dtype=float)
+    service = stops['service_days'].to_numpy(dtype=float)
+    xyz = _to_unit_sphere(coords[:, 0], coords[:, 1])
+
+    assigned = np.zeros(n, dtype=bool)
+    remaining = np.arange(n)
+    tree = cKDTree(xyz) if n else None
+    covered_in_tree = 0
+    seed_pointer = 0
+    routes: List[np.ndarray] = []
+
+    for _ in range(n_meus):
+        while seed_pointer < n and (assigned[seed_pointer] or service[seed_pointer] > days_per_meu):
+            seed_pointer += 1
+        if seed_pointer >= n:
+            break
+
+        current = seed_pointer
+        assigned[current] = True
+        covered_in_tree += 1
+        route = [current]
+        days_used = service[current]
+
+        while True:
+            # Rebuild the index once most of its points are covered so queries stay cheap
+            if len(remaining) > 64 and covered_in_tree > len(remaining) // 2:
+                remaining = remaining[~assigned[remaining]]
+                tree = cKDTree(xyz[remaining])
+                covered_in_tree = 0
+
+            # Stops farther than the remaining budget allows can never fit
+            reach_km = max(days_per_meu - days_used - service.min(), 0.0) * km_per_day
+            radius = 2 * np.sin(min(reach_km / (2 * EARTH_RADIUS_KM), np.pi / 2)) + 1e-12
+
+            k = min(neighbours, len(remaining))
+            best, best_cost = -1, 0.0
+            while k > 0:
+                dist, idx = tree.query(xyz[current], k=k, distance_upper_bound=radius)
+                in_reach = np.isfinite(np.atleast_1d(dist))
+                cand = remaining[np.atleast_1d(idx)[in_reach]]
+                cand = cand[~assigned[cand]]
+                if len(cand):
+                    travel = haversine_km(coords[current, 0], coords[current, 1],
+                                          coords[cand, 0], coords[cand, 1]) / km_per_day
+                    cost = travel + service[cand]
+                    fits = days_used + cost <= days_per_meu
+                    if fits.any():
+                        ratio = np.where(fits, priority[cand] / np.maximum(cost, 1e-9), -np.inf)
+                        j = int(np.argmax(ratio))
+                        best, best_cost = int(cand[j]), float(cost[j])
+                        break
+                # Every point within reach has been examined
+                if in_reach.sum() < k or k >= len(remaining):
+                    break
+                k = min(k * 4, len(remaining))
+
+            if best < 0:
+                break
+            assigned[best] = True
+            covered_in_tree += 1
+            route.append(best)
+            days_used += best_cost
+            current = best
+
+        routes.append(np.array(route, dtype=int))
+
+    km_greedy = sum(_route_length_km(r, coords) for r in routes)
+    if improve:
+        routes = [_two_opt(r, coords) for r in routes]
+    km_final = sum(_route_length_km(r, coords) for r in routes)
+
+    covered = np.concatenate(routes) if routes else np.array([], dtype=int)
+    stats = {
+        'n_stops': n,
+        'n_meus_used': len(routes),
+        'stops_covered': int(len(covered)),
+        'coverage_ratio': float(len(covered) / n) if n else 0.0,
+        'priority_covered_ratio': float(priority[covered].sum() / priority.sum()) if n else 0.0,
+        'total_km_greedy': km_greedy,
+        'total_km': km_final,
+        'two_opt_gain_km': km_greedy - km_final
+    }
+
+    return {'routes': routes, 'stats': stats}
+
+
+def build_meu_schedule(stops: pd.DataFrame,
+                        routes: List[np.ndarray],
+                        km_per_day: float = TRAVEL_KM_PER_DAY,
+                        daily_target: int = DAILY_ENROLLMENT_TARGET) -> pd.DataFrame:
+    """
+    Convert planned routes into a day-by-day schedule per MEU.
+
+    Args:
+        stops: Output of build_target_pincodes
+        routes: Routes returned by plan_meu_routes
+        km_per_day: Travel distance that costs one day
+        daily_target: Enrolments one MEU completes per day
+
+    Returns:
+        DataFrame with one row per MEU stop in visiting order
+    """
+    frames = []
+    coords = stops[['latitude', 'longitude']].to_numpy(dtype=float)
+
+    for meu_id, route in enumerate(routes, start=1):
+        pts = coords[route]
+        leg_km = np.zeros(len(route))
+        if len(route) > 1:
+            leg_km[1:] = haversine_km(pts[:-1, 0], pts[:-1, 1], pts[1:, 0], pts[1:, 1])
+
+        service = stops['service_days'].to_numpy()[route]
+        arrival = np.cumsum(leg_km / km_per_day + service) - service
+
+        frame = stops.iloc[route][['state', 'district', 'pincode', 'latitude',
+                                   'longitude', 'priority_score']].copy()
+        frame.insert(0, 'meu_id', meu_id)
+        frame.insert(1, 'stop_sequence', np.arange(1, len(route) + 1))
+        frame['leg_km'] = leg_km
+        frame['start_day'] = arrival
+        frame['end_day'] = arrival + service
+        frame['service_days'] = service
+        frame['expected_enrollments'] = np.minimum(stops['demand'].to_numpy()[route],
+                                                   service * daily_target)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['meu_id', 'stop_sequence', 'state', 'district', 'pincode'])
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def plan_meu_deployment(df_priority: pd.DataFrame,
+                         df_pincodes: pd.DataFrame,
+                         n_meus: int = 100,
+                         top_n: Optional[int] = None,
+                         days_per_meu: float = OPERATIONAL_DAYS_PER_MEU,
+                         daily_target: int = DAILY_ENROLLMENT_TARGET,
+                         km_per_day: float = TRAVEL_KM_PER_DAY) -> Dict:
+    """
+    Plan MEU coverage and routes for the ranked priority list.
+
+    Args:
+        df_priority: Output of calculate_priority_score
+        df_pincodes: Pincode centroids (state, district, pincode, latitude, longitude[, demand])
+        n_meus: Number of MEUs available
+        top_n: Restrict targets to the top N districts (if None, uses all)
+        days_per_meu: Working days available to each MEU
+        daily_target: Enrolments one MEU completes per day
+        km_per_day: Travel distance that costs one day
+
+    Returns:
+        Dictionary with 'schedule' DataFrame and 'stats' quality metrics
+    """
+    stops = build_target_pincodes(df_priority, df_pincodes, top_n=top_n, daily_target=daily_target)
+    plan = plan_meu_routes(stops, n_meus, days_per_meu=days_per_meu, km_per_day=km_per_day)
+    schedule = build_meu_schedule(stops, plan['routes'], km_per_day=km_per_day,
+                                  daily_target=daily_target)
+
+    return {'schedule': schedule, 'stats': plan['stats']}
+
+
+def summarize_schedule(schedule: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarise a schedule per MEU.
+
+    Args:
+        schedule: Output of build_meu_schedule
+
+    Returns:
+        DataFrame with stops, districts, distance, days and enrolments per MEU
+    """
+    summary = schedule.groupby('meu_id').agg({
+        'pincode': 'count',
+        'district': 'nunique',
+        'leg_km': 'sum',
+        'end_day': 'max',
+        'expected_enrollments': 'sum'
+    }).reset_index()
+    summary.columns = ['meu_id', 'stops', 'districts', 'total_km', 'days_used',
+                       'expected_enrollments']
+    return summary
+
+
+def benchmark_route_planner(n_pincodes: int = 5000,
+                             n_districts: int = 500,
+                             n_meus: int = 150,
+                             random_state: int = 42,
+                             history_path: Optional[str] = None) -> Dict:
+    """
+    Benchmark planner runtime and solution quality on synthetic pincodes.
+
+    Args:
+        n_pincodes: Number of synthetic target pincodes
+        n_districts: Number of synthetic districts
+        n_meus: Number of MEUs available
+        random_state: Random seed for reproducibility
+        history_path: JSON-lines file to append the result to (if None, doesn't save)
+
+    Returns:
+        Dictionary of runtime and quality statistics
+    """
+    rng = np.random.default_rng(random_state)
+
+    # Districts spread over India's bounding box, pincodes clustered around them
+    centres = np.column_stack([rng.uniform(8, 34, n_districts), rng.uniform(69, 96, n_districts)])
+    district_of = rng.integers(0, n_districts, n_pincodes)
+    latlon = centres[district_of] + rng.normal(0, 0.25, (n_pincodes, 2))
+
+    df_priority = pd.DataFrame({
+        'state': 'Synthetic',
+        'district': [f'D{i}' for i in range(n_districts)],
+        'priority_score': rng.uniform(0, 100, n_districts)
+    })
+    df_pincodes = pd.DataFrame({
+        'state': 'Synthetic',
+        'district': [f'D{i}' for i in district_of],
+        'pincode': np.arange(100000, 100000 + n_pincodes).astype(str),
+        'latitude': latlon[:, 0],
+        'longitude': latlon[:, 1],
+        'demand': rng.integers(50, 400, n_pincodes)
+    })
+
+    start = time.perf_counter()
+    result = plan_meu_deployment(df_priority, df_pincodes, n_meus=n_meus)
+    runtime = time.perf_counter() - start
+
+    stats = dict(result['stats'])
+    stats.update({
+        'benchmark': 'route_planner',
+        'n_pincodes': n_pincodes,
+        'n_districts': n_districts,
+        'n_meus': n_meus,
+        'runtime_seconds': runtime,
+        'timestamp': pd.Timestamp.now().isoformat()
+    })
+
+    if history_path:
+        with open(history_path, 'a') as f:
+            f.write(json.dumps(stats) + '\n')
+        print(f"Benchmark saved: {history_path}")
+
+    return stats